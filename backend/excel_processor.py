@@ -8,6 +8,9 @@ import zipfile
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Bump whenever processing output changes so cached previews are invalidated
+PROCESSOR_VERSION = "1.0.0"
+
 class ExcelProcessor:
     def __init__(self, input_file: Path):
         """Initialize the Excel processor with input file path."""
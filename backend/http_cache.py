@@ -0,0 +1,249 @@
+import gzip
+import hashlib
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, JSONResponse, Response, StreamingResponse
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+# JSON payloads smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = 1024
+# Favour speed over ratio: both are roughly gzip -6 throughput
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+CHUNK_SIZE = 64 * 1024
+
+# Content hashes keyed by path, invalidated when mtime or size changes
+_digest_cache: Dict[str, Tuple[int, int, str]] = {}
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be satisfied for the file size."""
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file, re-hashing only when the file changes."""
+    stat = path.stat()
+    key = str(path.resolve())
+    cached = _digest_cache.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            sha.update(chunk)
+    digest = sha.hexdigest()
+    _digest_cache[key] = (stat.st_mtime_ns, stat.st_size, digest)
+    return digest
+
+
+def make_etag(*parts: Any, weak: bool = False) -> str:
+    """Build a quoted ETag from the given parts."""
+    tag = hashlib.sha256(":".join(str(p) for p in parts).encode()).hexdigest()[:32]
+    return f'W/"{tag}"' if weak else f'"{tag}"'
+
+
+def http_date(path: Path) -> str:
+    """Format a file's modification time as an HTTP date."""
+    return formatdate(path.stat().st_mtime, usegmt=True)
+
+
+def _strip_weak(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, etag: str, last_modified: str, etag_only: bool = False) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the validators.
+
+    Set ``etag_only`` for responses derived from more than the file's mtime
+    (e.g. processor output), where a date alone cannot prove freshness.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {_strip_weak(t) for t in if_none_match.split(",")}
+        return _strip_weak(etag) in candidates
+
+    if etag_only:
+        return False
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def validator_headers(etag: str, last_modified: str) -> Dict[str, str]:
+    """Headers that let clients revalidate instead of re-downloading."""
+    return {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Cache-Control": "no-cache",
+    }
+
+
+def not_modified(etag: str, last_modified: str, vary: Optional[str] = None) -> Response:
+    headers = validator_headers(etag, last_modified)
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=304, headers=headers)
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    qualities = {}
+    for part in header.split(","):
+        coding, *params = [p.strip() for p in part.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    return qualities
+
+
+def _pick_encoding(request: Request) -> Optional[str]:
+    """Choose br or gzip per the client's q-values, or None for identity."""
+    qualities = _parse_accept_encoding(request.headers.get("accept-encoding", ""))
+    wildcard = qualities.get("*")
+
+    def quality(coding: str) -> float:
+        if coding in qualities:
+            return qualities[coding]
+        if wildcard is not None:
+            return wildcard
+        # identity is acceptable unless explicitly refused
+        return 1.0 if coding == "identity" else 0.0
+
+    # Ties are broken in this order: smallest payload first
+    candidates = ["br", "gzip", "identity"] if brotli is not None else ["gzip", "identity"]
+    best = max(candidates, key=lambda c: (quality(c), -candidates.index(c)))
+    if best == "identity" or quality(best) <= 0:
+        return None
+    return best
+
+
+def _encode_body(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_LEVEL)
+    return body
+
+
+async def cached_json_response(request: Request, content: Any, etag: str, last_modified: str) -> Response:
+    """Render JSON with validators, compressing it when it is large enough."""
+    body = JSONResponse(content=jsonable_encoder(content)).body
+    headers = validator_headers(etag, last_modified)
+    headers["Vary"] = "Accept-Encoding"
+
+    encoding = _pick_encoding(request) if len(body) >= COMPRESSION_MIN_SIZE else None
+    if encoding:
+        # Compressing multi-MB previews would otherwise stall the event loop
+        body = await run_in_threadpool(_encode_body, body, encoding)
+        headers["Content-Encoding"] = encoding
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def parse_range(range_header: str, size: int) -> Optional[Tuple[int, int]]:
+    """Parse a single ``bytes=`` range into inclusive (start, end) offsets.
+
+    Returns None when the header should be ignored (malformed or multiple
+    ranges), in which case the full file is served.
+    """
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep:
+        return None
+    if size == 0:
+        raise RangeNotSatisfiable()
+    try:
+        if start_str == "":
+            # Suffix range: the last N bytes
+            length = int(end_str)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        raise RangeNotSatisfiable()
+    if start > end:
+        return None
+    return start, min(end, size - 1)
+
+
+def _iter_file_range(path: Path, start: int, end: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def file_response(request: Request, path: Path) -> Response:
+    """Serve a file with validators, 304 handling and single byte-range support."""
+    size = path.stat().st_size
+    etag = make_etag(await run_in_threadpool(file_digest, path), size)
+    last_modified = http_date(path)
+
+    if is_not_modified(request, etag, last_modified):
+        return not_modified(etag, last_modified)
+
+    headers = validator_headers(etag, last_modified)
+    headers["Accept-Ranges"] = "bytes"
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # A stale If-Range means the client's partial copy is outdated: send it all
+    if range_header and (if_range is None or if_range.strip() in (etag, last_modified)):
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            headers["Content-Range"] = f"bytes */{size}"
+            return Response(status_code=416, headers=headers)
+
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+            headers["Content-Length"] = str(end - start + 1)
+            return StreamingResponse(
+                _iter_file_range(path, start, end),
+                status_code=206,
+                media_type=mimetypes.guess_type(path.name)[0] or "application/octet-stream",
+                headers=headers,
+            )
+
+    return FileResponse(path, headers=headers)
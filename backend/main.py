@@ -1,6 +1,6 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.staticfiles import StaticFiles
 from typing import List, Optional
 import pandas as pd
@@ -8,7 +8,16 @@ import os
 from datetime import datetime
 import json
 from pathlib import Path
-from backend.excel_processor import ExcelProcessor
+from backend.excel_processor import ExcelProcessor, PROCESSOR_VERSION
+from backend.http_cache import (
+    cached_json_response,
+    file_digest,
+    file_response,
+    http_date,
+    is_not_modified,
+    make_etag,
+    not_modified,
+)
 import zipfile
 import asyncio
 import time
@@ -67,23 +76,39 @@ async def get_available_cpus(filename: str):
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/preview/{filename}/{cpu}")
-async def preview_cpu(filename: str, cpu: str):
+async def preview_cpu(request: Request, filename: str, cpu: str):
     try:
         file_path = UPLOAD_DIR / filename
+        # Validators come from the input content and processor version, so a
+        # repeat view is answered without opening the workbook at all. The
+        # upload's mtime says nothing about PROCESSOR_VERSION, so only the
+        # ETag is trusted for revalidation.
+        digest = await run_in_threadpool(file_digest, file_path)
+        etag = make_etag(digest, PROCESSOR_VERSION, "preview", cpu, weak=True)
+        last_modified = http_date(file_path)
+        if is_not_modified(request, etag, last_modified, etag_only=True):
+            return not_modified(etag, last_modified, vary="Accept-Encoding")
+
         processor = ExcelProcessor(file_path)
         preview_data = processor.preview_cpu_tab(cpu)
-        return preview_data
+        return await cached_json_response(request, preview_data, etag, last_modified)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @app.get("/data/{filename}/{cpu}")
-async def get_cpu_data(filename: str, cpu: str, section: str, page: int = 0, page_size: int = 1000):
+async def get_cpu_data(request: Request, filename: str, cpu: str, section: str, page: int = 0, page_size: int = 1000):
     """Get paginated data for a specific CPU and section."""
     try:
         file_path = UPLOAD_DIR / filename
+        digest = await run_in_threadpool(file_digest, file_path)
+        etag = make_etag(digest, PROCESSOR_VERSION, "data", cpu, section, page, page_size, weak=True)
+        last_modified = http_date(file_path)
+        if is_not_modified(request, etag, last_modified, etag_only=True):
+            return not_modified(etag, last_modified, vary="Accept-Encoding")
+
         processor = ExcelProcessor(file_path)
         data = processor.get_section_data(cpu, section, page, page_size)
-        return data
+        return await cached_json_response(request, data, etag, last_modified)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -183,11 +208,11 @@ async def get_progress(job_id: str):
     return processing_status[job_id]
 
 @app.get("/download/{filename}")
-async def download_file(filename: str):
+async def download_file(request: Request, filename: str):
     file_path = OUTPUT_DIR / filename
     if not file_path.exists():
         raise HTTPException(status_code=404, detail="File not found")
-    return FileResponse(file_path)
+    return await file_response(request, file_path)
 
 @app.get("/history/")
 async def get_history():
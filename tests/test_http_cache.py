@@ -0,0 +1,164 @@
+from email.utils import formatdate
+
+import pytest
+from fastapi import FastAPI, Request
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from backend import http_cache
+from backend.http_cache import (
+    RangeNotSatisfiable,
+    cached_json_response,
+    file_response,
+    is_not_modified,
+    not_modified,
+    parse_range,
+)
+
+PAYLOAD = {"rows": [{"Trigger Value": i, "Description": f"Fault {i}"} for i in range(200)]}
+ETAG = 'W/"preview"'
+LAST_MODIFIED = formatdate(0, usegmt=True)
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    path = tmp_path / "CPU01_Faults.zip"
+    path.write_bytes(bytes(range(256)) * 4)
+    return path
+
+
+@pytest.fixture
+def client(data_file):
+    app = FastAPI()
+
+    @app.get("/download")
+    async def download(request: Request):
+        return await file_response(request, data_file)
+
+    @app.get("/preview")
+    async def preview(request: Request):
+        if is_not_modified(request, ETAG, LAST_MODIFIED, etag_only=True):
+            return not_modified(ETAG, LAST_MODIFIED, vary="Accept-Encoding")
+        return await cached_json_response(request, PAYLOAD, ETAG, LAST_MODIFIED)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=10-", (10, 99)),
+    ("bytes=-5", (95, 99)),
+    ("bytes=-500", (0, 99)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=0-1,5-6", None),
+    ("bytes=9-3", None),
+    ("items=0-9", None),
+    ("bytes=abc", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header, size", [("bytes=100-", 100), ("bytes=-0", 100), ("bytes=0-", 0)])
+def test_parse_range_unsatisfiable(header, size):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, size)
+
+
+def test_download_full_and_revalidate(client, data_file):
+    response = client.get("/download")
+    assert response.status_code == 200
+    assert response.content == data_file.read_bytes()
+    assert response.headers["accept-ranges"] == "bytes"
+
+    etag = response.headers["etag"]
+    assert client.get("/download", headers={"If-None-Match": etag}).status_code == 304
+    modified = response.headers["last-modified"]
+    assert client.get("/download", headers={"If-Modified-Since": modified}).status_code == 304
+
+
+def test_download_if_none_match_takes_precedence(client):
+    modified = client.get("/download").headers["last-modified"]
+    headers = {"If-None-Match": '"other"', "If-Modified-Since": modified}
+    assert client.get("/download", headers=headers).status_code == 200
+
+
+def test_download_range(client, data_file):
+    content = data_file.read_bytes()
+
+    response = client.get("/download", headers={"Range": "bytes=10-19"})
+    assert response.status_code == 206
+    assert response.content == content[10:20]
+    assert response.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+    response = client.get("/download", headers={"Range": "bytes=-5"})
+    assert response.status_code == 206
+    assert response.content == content[-5:]
+
+
+def test_download_multi_range_serves_full_file(client, data_file):
+    response = client.get("/download", headers={"Range": "bytes=0-1,5-6"})
+    assert response.status_code == 200
+    assert response.content == data_file.read_bytes()
+
+
+def test_download_unsatisfiable_range(client, data_file):
+    response = client.get("/download", headers={"Range": "bytes=999999-"})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{data_file.stat().st_size}"
+
+
+def test_download_if_range(client, data_file):
+    etag = client.get("/download").headers["etag"]
+
+    fresh = client.get("/download", headers={"Range": "bytes=0-3", "If-Range": etag})
+    assert fresh.status_code == 206
+
+    stale = client.get("/download", headers={"Range": "bytes=0-3", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == data_file.read_bytes()
+
+
+def test_preview_compression_threshold(client, monkeypatch):
+    response = client.get("/preview", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == PAYLOAD
+
+    monkeypatch.setattr(http_cache, "COMPRESSION_MIN_SIZE", 10 ** 9)
+    response = client.get("/preview", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.json() == PAYLOAD
+
+
+@pytest.mark.parametrize("accept_encoding", ["gzip;q=0", "identity", "*;q=0, identity", ""])
+def test_preview_respects_refused_encodings(client, monkeypatch, accept_encoding):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    response = client.get("/preview", headers={"Accept-Encoding": accept_encoding})
+    assert "content-encoding" not in response.headers
+    assert response.json() == PAYLOAD
+
+
+def test_preview_wildcard_accepts_gzip(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    response = client.get("/preview", headers={"Accept-Encoding": "*"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == PAYLOAD
+
+
+def test_preview_ignores_if_modified_since(client):
+    assert client.get("/preview", headers={"If-None-Match": ETAG}).status_code == 304
+    headers = {"If-Modified-Since": formatdate(usegmt=True)}
+    assert client.get("/preview", headers=headers).status_code == 200
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    ("br, gzip", "br"),
+    ("br;q=0, gzip", "gzip"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("gzip;q=0, br;q=0", None),
+])
+def test_pick_encoding_with_brotli(monkeypatch, accept_encoding, expected):
+    monkeypatch.setattr(http_cache, "brotli", object())
+    request = Request({"type": "http", "headers": [(b"accept-encoding", accept_encoding.encode())]})
+    assert http_cache._pick_encoding(request) == expected